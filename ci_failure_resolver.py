@@ -5,11 +5,27 @@ Automatically detects and resolves GitHub Actions workflow failures
 """
 
 import os
-import json
+import io
+import time
+from collections import OrderedDict
+import asyncio
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import aiohttp
 import requests
-import yaml
+from ruamel.yaml import YAML
+from diskcache import Cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 from datetime import datetime, timedelta
+
+# orjson parses GitHub's JSON payloads several times faster than the
+# stdlib; fall back to stdlib json when it isn't installed
+try:
+    import orjson as jsonlib
+except ImportError:
+    import json as jsonlib
 from typing import Dict, List, Optional, Tuple
 import logging
 
@@ -20,6 +36,85 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Logs are streamed in chunks and only the most recent bytes are retained;
+# failure output appears at the end of a job log, so the tail is what matters
+MAX_LOG_BYTES = 5 * 1024 * 1024
+LOG_CHUNK_SIZE = 65536
+
+# How long a resolution report stays valid for an unchanged set of failing
+# runs - guards against overlapping cron invocations and quick re-runs
+RESOLUTION_CYCLE_TTL = 300
+
+# Logs are large, so the in-process memo keeps only the most recent few
+LOGS_MEMO_SIZE = 32
+
+# CodeQL-supported languages keyed by file extension for O(1) lookup per file
+EXT_TO_LANG = {
+    '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript',
+    '.tsx': 'javascript', '.vue': 'javascript',
+    '.py': 'python',
+    '.java': 'java',
+    '.cs': 'csharp',
+    '.cpp': 'cpp', '.c': 'cpp', '.cc': 'cpp', '.cxx': 'cpp',
+    '.h': 'cpp', '.hpp': 'cpp',
+    '.go': 'go',
+    '.rb': 'ruby',
+}
+
+# Directories that never contain first-party source worth scanning
+SKIP_DIRS = {'node_modules', 'venv', 'dist', 'build', '__pycache__', 'target'}
+
+# Compiled once per process - every resolver instance shares these
+
+# Keywords whose presence in a job log feeds the common-issue buckets
+TRIGGER_KEYWORDS = (
+    'permission', 'forbidden', 'deprecated', 'not found',
+    'invalid', 'expired', 'token', 'action',
+)
+
+# Single case-insensitive pass collects all failure-trigger keywords
+_TRIGGER_RE = re.compile(
+    '(?i)(' + '|'.join(re.escape(keyword) for keyword in TRIGGER_KEYWORDS) + ')'
+)
+
+# When pyahocorasick is installed, the keyword sweep runs in its C automaton
+# instead of the regex engine - noticeably faster on multi-MB logs
+try:
+    import ahocorasick
+
+    _TRIGGER_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in TRIGGER_KEYWORDS:
+        _TRIGGER_AUTOMATON.add_word(_keyword, _keyword)
+    _TRIGGER_AUTOMATON.make_automaton()
+except ImportError:
+    _TRIGGER_AUTOMATON = None
+
+# Anchored on the error-line prefixes GitHub Actions emits, so most log
+# lines are rejected without scanning their content
+_ERROR_LINE_RE = re.compile(r'(?m)^(?:##\[error\]|Error:)\s*(.+)$')
+_CODEQL_ERROR_RE = re.compile(
+    r"No source code was seen|Language '(?:javascript|python)' not found|Autobuild failed"
+)
+
+# Known error messages (matched against error-line suffixes by prefix)
+README_ERROR_HINTS = {
+    "Request failed": "API request failure - possibly rate limited or token issue",
+    "Cannot read": "README file access issue - check file permissions",
+    "No recent activity": "No recent activity found - this might be expected",
+}
+
+CODEQL_ERROR_HINTS = {
+    "No source code was seen": "No source code found for specified languages",
+    "Language": "Specified languages not present in repository",
+    "Autobuild failed": "Autobuild process failed - may need manual build steps",
+}
+
+METRICS_ERROR_HINTS = {
+    "Request failed": "Metrics API request failed",
+    "Invalid token": "Invalid or insufficient token permissions",
+    "Rate limit": "Rate limit exceeded",
+}
+
 class GitHubActionsResolver:
     """Agent for resolving GitHub Actions workflow failures"""
     
@@ -33,7 +128,40 @@ class GitHubActionsResolver:
             "Accept": "application/vnd.github.v3+json"
         }
         self.fixes_applied = []
-        
+        self.max_concurrency = 20
+        # Parsed workflow files keyed by path, so fixes touching the same
+        # file don't re-read and re-parse it
+        self._yaml_cache: Dict[str, Tuple[int, dict]] = {}
+        # Round-trip YAML preserves comments, ordering and quoting when
+        # workflow files are rewritten
+        self._yaml = YAML()
+        self._yaml.default_flow_style = False
+        self._yaml.preserve_quotes = True
+        # Completed runs and their logs are immutable, so responses can be
+        # cached on disk indefinitely and reused across invocations
+        self.cache = Cache('.ci_resolver_cache')
+        # In-process memos on top of the disk cache: job listings are kept
+        # even for non-terminal runs (which the disk cache skips), and the
+        # most recent logs avoid repeated disk reads within one cycle
+        self._jobs_memo: Dict[int, List[Dict]] = {}
+        self._logs_memo: OrderedDict = OrderedDict()
+
+        # Pooled session: reuses TCP/TLS connections across calls and
+        # transparently retries transient GitHub errors with backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.3,
+                status_forcelist=[429, 502, 503, 504],
+                respect_retry_after_header=True
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.headers.update(self.headers)
+
     def get_failed_runs(self, limit: int = 10) -> List[Dict]:
         """Get recent failed workflow runs"""
         url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/actions/runs"
@@ -41,41 +169,220 @@ class GitHubActionsResolver:
             "status": "failure",
             "per_page": limit
         }
-        
+        cache_key = f"failed_runs:{limit}"
+
+        headers = {}
+        etag = self.cache.get(f"etag:{cache_key}")
+        if etag:
+            headers["If-None-Match"] = etag
+
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=headers, params=params)
+            if response.status_code == 304:
+                # Listing unchanged since last fetch - serve the cached body
+                return self.cache.get(cache_key, [])
             response.raise_for_status()
-            return response.json().get("workflow_runs", [])
+            runs = jsonlib.loads(response.content).get("workflow_runs", [])
+
+            etag = response.headers.get("ETag") if response.headers else None
+            if etag:
+                self.cache.set(f"etag:{cache_key}", etag, expire=None)
+                self.cache.set(cache_key, runs, expire=None)
+
+            self._respect_rate_limit(response)
+            return runs
         except requests.RequestException as e:
             logger.error(f"Failed to fetch workflow runs: {e}")
             return []
-    
+
+    @staticmethod
+    def _respect_rate_limit(response):
+        """Sleep through an exhausted rate-limit window instead of erroring next call"""
+        try:
+            remaining = int(response.headers.get("X-RateLimit-Remaining", 1))
+            reset = int(response.headers.get("X-RateLimit-Reset", 0))
+        except (TypeError, ValueError):
+            return
+
+        if remaining == 0:
+            wait = max(0, reset - time.time())
+            if wait:
+                logger.warning(f"GitHub rate limit exhausted - sleeping {wait:.0f}s until reset")
+                time.sleep(wait)
+
     def get_run_jobs(self, run_id: int) -> List[Dict]:
         """Get jobs for a specific workflow run"""
+        if run_id in self._jobs_memo:
+            return self._jobs_memo[run_id]
+        cached = self.cache.get(f"jobs:{run_id}")
+        if cached is not None:
+            return cached
+
         url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/actions/runs/{run_id}/jobs"
-        
+
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url)
             response.raise_for_status()
-            return response.json().get("jobs", [])
+            jobs = jsonlib.loads(response.content).get("jobs", [])
+            self._jobs_memo[run_id] = jobs
+            self._cache_jobs(run_id, jobs)
+            self._respect_rate_limit(response)
+            return jobs
         except requests.RequestException as e:
             logger.error(f"Failed to fetch jobs for run {run_id}: {e}")
             return []
-    
+
+    def _cache_jobs(self, run_id: int, jobs: List[Dict]):
+        """Cache a job listing, but only once every job has reached a terminal state"""
+        if jobs and all(job.get("status") == "completed" for job in jobs):
+            self.cache.set(f"jobs:{run_id}", jobs, expire=None)
+
+    @staticmethod
+    def _trim_log_buffer(parts: List[bytes], size: int) -> int:
+        """Drop leading chunks so the retained log stays within MAX_LOG_BYTES"""
+        while size > MAX_LOG_BYTES and len(parts) > 1:
+            size -= len(parts.pop(0))
+        return size
+
+    def _memo_logs(self, job_id: int, logs: str):
+        """Remember a log in the bounded in-process LRU"""
+        self._logs_memo[job_id] = logs
+        self._logs_memo.move_to_end(job_id)
+        while len(self._logs_memo) > LOGS_MEMO_SIZE:
+            self._logs_memo.popitem(last=False)
+
+    def _recall_logs(self, job_id: int) -> Optional[str]:
+        """Look a log up in the in-process LRU, then the disk cache"""
+        if job_id in self._logs_memo:
+            self._logs_memo.move_to_end(job_id)
+            return self._logs_memo[job_id]
+        return self.cache.get(f"logs:{job_id}")
+
     def get_job_logs(self, job_id: int) -> str:
-        """Get logs for a specific job"""
+        """Get logs for a specific job, streamed in chunks and capped at MAX_LOG_BYTES
+
+        Callers only request logs for completed jobs.
+        """
+        cached = self._recall_logs(job_id)
+        if cached is not None:
+            return cached
+
         url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/actions/jobs/{job_id}/logs"
-        
+
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.text
+            with self.session.get(url, stream=True) as response:
+                response.raise_for_status()
+                parts, size = [], 0
+                for chunk in response.iter_content(chunk_size=LOG_CHUNK_SIZE):
+                    parts.append(chunk)
+                    size = self._trim_log_buffer(parts, size + len(chunk))
+            logs = b"".join(parts).decode("utf-8", errors="replace")
+            self._memo_logs(job_id, logs)
+            self.cache.set(f"logs:{job_id}", logs, expire=None)
+            return logs
         except requests.RequestException as e:
             logger.error(f"Failed to fetch logs for job {job_id}: {e}")
             return ""
     
+    async def _aget_run_jobs(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, run_id: int) -> List[Dict]:
+        """Async variant of get_run_jobs"""
+        if run_id in self._jobs_memo:
+            return self._jobs_memo[run_id]
+        cached = self.cache.get(f"jobs:{run_id}")
+        if cached is not None:
+            return cached
+
+        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/actions/runs/{run_id}/jobs"
+
+        try:
+            async with semaphore:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    data = jsonlib.loads(await response.read())
+            jobs = data.get("jobs", [])
+            self._jobs_memo[run_id] = jobs
+            self._cache_jobs(run_id, jobs)
+            return jobs
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to fetch jobs for run {run_id}: {e}")
+            return []
+
+    async def _aget_job_logs(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, job_id: int) -> str:
+        """Async variant of get_job_logs (only called for completed failed jobs)"""
+        cached = self._recall_logs(job_id)
+        if cached is not None:
+            return cached
+
+        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/actions/jobs/{job_id}/logs"
+
+        try:
+            async with semaphore:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    parts, size = [], 0
+                    async for chunk in response.content.iter_chunked(LOG_CHUNK_SIZE):
+                        parts.append(chunk)
+                        size = self._trim_log_buffer(parts, size + len(chunk))
+            logs = b"".join(parts).decode("utf-8", errors="replace")
+            self._memo_logs(job_id, logs)
+            self.cache.set(f"logs:{job_id}", logs, expire=None)
+            return logs
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to fetch logs for job {job_id}: {e}")
+            return ""
+
+    async def _aget_run_log_archive(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, run_id: int) -> Dict[str, str]:
+        """Fetch the whole-run log archive and split it into per-job-name logs
+
+        One archive download covers every job in the run, so runs with several
+        failed jobs need a single call instead of one /logs call per job.
+        """
+        cached = self.cache.get(f"run_logs:{run_id}")
+        if cached is not None:
+            return cached
+
+        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/actions/runs/{run_id}/logs"
+
+        try:
+            async with semaphore:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    payload = await response.read()
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to fetch log archive for run {run_id}: {e}")
+            return {}
+
+        logs_by_job = {}
+        try:
+            with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+                for name in archive.namelist():
+                    # Top-level members are named "<n>_<job name>.txt"
+                    if "/" in name or not name.endswith(".txt"):
+                        continue
+                    _, _, job_name = name[:-4].partition("_")
+                    text = archive.read(name).decode("utf-8", errors="replace")
+                    logs_by_job[job_name] = text[-MAX_LOG_BYTES:]
+        except zipfile.BadZipFile as e:
+            logger.error(f"Invalid log archive for run {run_id}: {e}")
+            return {}
+
+        self.cache.set(f"run_logs:{run_id}", logs_by_job, expire=None)
+        return logs_by_job
+
+    def _find_triggers(self, logs: str) -> set:
+        """Collect the failure-trigger keywords present in a log in a single scan"""
+        if _TRIGGER_AUTOMATON is not None:
+            # The automaton is case-sensitive, so one lowercased copy stands
+            # in for the regex engine's case-insensitive matching
+            return {keyword for _, keyword in _TRIGGER_AUTOMATON.iter(logs.lower())}
+        return {match.group(1).lower() for match in _TRIGGER_RE.finditer(logs)}
+
     def analyze_failure_patterns(self, failed_runs: List[Dict]) -> Dict[str, List[str]]:
         """Analyze failure patterns across multiple runs"""
+        return asyncio.run(self.analyze_failure_patterns_async(failed_runs))
+
+    async def analyze_failure_patterns_async(self, failed_runs: List[Dict]) -> Dict[str, List[str]]:
+        """Analyze failure patterns across multiple runs, fetching jobs and logs concurrently"""
         patterns = {
             "profile_readme_failures": [],
             "codeql_failures": [],
@@ -84,65 +391,130 @@ class GitHubActionsResolver:
             "action_version_issues": [],
             "token_issues": []
         }
-        
-        for run in failed_runs:
-            workflow_name = run.get("name", "").lower()
-            jobs = self.get_run_jobs(run["id"])
-            
-            for job in jobs:
-                if job.get("conclusion") == "failure":
-                    logs = self.get_job_logs(job["id"])
-                    
-                    # Analyze specific failure patterns
-                    if "readme" in workflow_name and "activity" in workflow_name:
-                        patterns["profile_readme_failures"].append(self._analyze_readme_failure(logs))
-                    elif "codeql" in workflow_name:
-                        patterns["codeql_failures"].append(self._analyze_codeql_failure(logs))
-                    elif "metrics" in workflow_name or "stats" in workflow_name:
-                        patterns["metrics_failures"].append(self._analyze_metrics_failure(logs))
-                    
-                    # Check for common issues
-                    if "permission" in logs.lower() or "forbidden" in logs.lower():
-                        patterns["permission_errors"].append(f"Run {run['id']}: Permission denied")
-                    
-                    if "action" in logs.lower() and ("deprecated" in logs.lower() or "not found" in logs.lower()):
-                        patterns["action_version_issues"].append(f"Run {run['id']}: Action version issue")
-                    
-                    if "token" in logs.lower() and ("invalid" in logs.lower() or "expired" in logs.lower()):
-                        patterns["token_issues"].append(f"Run {run['id']}: Token issue")
-        
+
+        # The listing is filtered by status, which can still include
+        # in-progress or cancelled runs - only concluded failures are worth
+        # spending job-fetch API calls on
+        failed_runs = [run for run in failed_runs if run.get("conclusion") == "failure"]
+        if not failed_runs:
+            return patterns
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
+            # Fetch the jobs for every run in one concurrent batch
+            jobs_per_run = await asyncio.gather(
+                *[self._aget_run_jobs(session, semaphore, run["id"]) for run in failed_runs],
+                return_exceptions=True
+            )
+
+            failed_jobs = []
+            for run, jobs in zip(failed_runs, jobs_per_run):
+                if isinstance(jobs, BaseException):
+                    logger.error(f"Failed to fetch jobs for run {run['id']}: {jobs}")
+                    continue
+                # Lowercase the workflow name once per run, not once per job
+                workflow_name = run.get("name", "").lower()
+                failed_jobs.extend(
+                    (run["id"], workflow_name, job)
+                    for job in jobs if job.get("conclusion") == "failure"
+                )
+
+            # Runs with several failed jobs get their logs from one archive
+            # call per run; everything else falls back to the per-job endpoint
+            jobs_by_run = {}
+            for run_id, _, job in failed_jobs:
+                jobs_by_run.setdefault(run_id, []).append(job)
+            archive_run_ids = [run_id for run_id, jobs in jobs_by_run.items() if len(jobs) > 1]
+
+            archives = await asyncio.gather(
+                *[self._aget_run_log_archive(session, semaphore, run_id) for run_id in archive_run_ids],
+                return_exceptions=True
+            )
+            archive_by_run = {}
+            for run_id, archive in zip(archive_run_ids, archives):
+                if isinstance(archive, BaseException):
+                    logger.error(f"Failed to fetch log archive for run {run_id}: {archive}")
+                elif archive:
+                    archive_by_run[run_id] = archive
+
+            logs_per_job: List = [
+                archive_by_run.get(run_id, {}).get(job.get("name"))
+                for run_id, _, job in failed_jobs
+            ]
+
+            # Fetch individually whatever the archives did not cover
+            pending = [i for i, logs in enumerate(logs_per_job) if logs is None]
+            fetched = await asyncio.gather(
+                *[self._aget_job_logs(session, semaphore, failed_jobs[i][2]["id"]) for i in pending],
+                return_exceptions=True
+            )
+            for i, logs in zip(pending, fetched):
+                logs_per_job[i] = logs
+
+        for (run_id, workflow_name, job), logs in zip(failed_jobs, logs_per_job):
+            if isinstance(logs, BaseException):
+                logger.error(f"Failed to fetch logs for job {job['id']}: {logs}")
+                continue
+            self._classify_job_failure(run_id, workflow_name, logs, patterns)
+
         return patterns
+
+    def _classify_job_failure(self, run_id: int, workflow_name: str, logs: str, patterns: Dict[str, List[str]]):
+        """Bucket one failed job's logs into the pattern dict, scanning the logs once per check"""
+        # Analyze specific failure patterns
+        if "readme" in workflow_name and "activity" in workflow_name:
+            patterns["profile_readme_failures"].append(self._analyze_readme_failure(logs))
+        elif "codeql" in workflow_name:
+            patterns["codeql_failures"].append(self._analyze_codeql_failure(logs))
+        elif "metrics" in workflow_name or "stats" in workflow_name:
+            patterns["metrics_failures"].append(self._analyze_metrics_failure(logs))
+
+        # Check for common issues - no lowercased log copies, just one
+        # case-insensitive trigger pass
+        triggers = self._find_triggers(logs)
+
+        if "permission" in triggers or "forbidden" in triggers:
+            patterns["permission_errors"].append(f"Run {run_id}: Permission denied")
+
+        if "action" in triggers and ("deprecated" in triggers or "not found" in triggers):
+            patterns["action_version_issues"].append(f"Run {run_id}: Action version issue")
+
+        if "token" in triggers and ("invalid" in triggers or "expired" in triggers):
+            patterns["token_issues"].append(f"Run {run_id}: Token issue")
     
+    @staticmethod
+    def _match_hint(message: str, hints: Dict[str, str]) -> Optional[str]:
+        """Map an error message to a diagnosis by known-prefix lookup"""
+        for prefix, diagnosis in hints.items():
+            if message.startswith(prefix):
+                return diagnosis
+        return None
+
     def _analyze_readme_failure(self, logs: str) -> str:
         """Analyze README activity workflow failures"""
-        if "jamesgeorge007/github-activity-readme" in logs:
-            if "Error: Request failed" in logs:
-                return "API request failure - possibly rate limited or token issue"
-            elif "Error: Cannot read" in logs:
-                return "README file access issue - check file permissions"
-            elif "Error: No recent activity" in logs:
-                return "No recent activity found - this might be expected"
+        for match in _ERROR_LINE_RE.finditer(logs):
+            diagnosis = self._match_hint(match.group(1), README_ERROR_HINTS)
+            if diagnosis:
+                return diagnosis
         return "Unknown README workflow failure"
-    
+
     def _analyze_codeql_failure(self, logs: str) -> str:
         """Analyze CodeQL workflow failures"""
-        if "No source code was seen during the build" in logs:
-            return "No source code found for specified languages"
-        elif "Language 'javascript' not found" in logs or "Language 'python' not found" in logs:
-            return "Specified languages not present in repository"
-        elif "Autobuild failed" in logs:
-            return "Autobuild process failed - may need manual build steps"
+        match = _CODEQL_ERROR_RE.search(logs)
+        if match:
+            diagnosis = self._match_hint(match.group(0), CODEQL_ERROR_HINTS)
+            if diagnosis:
+                return diagnosis
         return "Unknown CodeQL failure"
-    
+
     def _analyze_metrics_failure(self, logs: str) -> str:
         """Analyze metrics workflow failures"""
-        if "lowlighter/metrics" in logs:
-            if "Error: Request failed" in logs:
-                return "Metrics API request failed"
-            elif "Error: Invalid token" in logs:
-                return "Invalid or insufficient token permissions"
-            elif "Error: Rate limit" in logs:
-                return "Rate limit exceeded"
+        for match in _ERROR_LINE_RE.finditer(logs):
+            diagnosis = self._match_hint(match.group(1), METRICS_ERROR_HINTS)
+            if diagnosis:
+                return diagnosis
         return "Unknown metrics failure"
     
     def generate_fixes(self, patterns: Dict[str, List[str]]) -> List[Dict]:
@@ -186,13 +558,30 @@ class GitHubActionsResolver:
         
         return fixes
     
+    def _load_workflow(self, path: str) -> dict:
+        """Parse a workflow file, memoizing the result on (path, mtime)"""
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._yaml_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, 'r') as f:
+            workflow = self._yaml.load(f)
+        self._yaml_cache[path] = (mtime, workflow)
+        return workflow
+
+    def _save_workflow(self, path: str, workflow: dict):
+        """Write a workflow file and refresh its cache entry"""
+        with open(path, 'w') as f:
+            self._yaml.dump(workflow, f)
+        self._yaml_cache[path] = (os.stat(path).st_mtime_ns, workflow)
+
     def _fix_profile_readme_workflow(self) -> bool:
         """Fix the profile README workflow"""
         try:
             # Read current workflow
-            with open('.github/workflows/profile-readme.yml', 'r') as f:
-                workflow = yaml.safe_load(f)
-            
+            workflow = self._load_workflow('.github/workflows/profile-readme.yml')
+
             # Update to a more stable action version
             for job_name, job in workflow.get('jobs', {}).items():
                 for i, step in enumerate(job.get('steps', [])):
@@ -207,9 +596,8 @@ class GitHubActionsResolver:
                             }
             
             # Write updated workflow
-            with open('.github/workflows/profile-readme.yml', 'w') as f:
-                yaml.dump(workflow, f, default_flow_style=False)
-            
+            self._save_workflow('.github/workflows/profile-readme.yml', workflow)
+
             self.fixes_applied.append("Updated profile README workflow to stable version")
             return True
             
@@ -221,9 +609,8 @@ class GitHubActionsResolver:
         """Fix the CodeQL workflow"""
         try:
             # Read current workflow
-            with open('.github/workflows/codeql-analysis.yml', 'r') as f:
-                workflow = yaml.safe_load(f)
-            
+            workflow = self._load_workflow('.github/workflows/codeql-analysis.yml')
+
             # Check what languages actually exist in the repo
             detected_languages = self._detect_repository_languages()
             
@@ -242,49 +629,74 @@ class GitHubActionsResolver:
                 self.fixes_applied.append(f"Updated CodeQL languages to: {detected_languages}")
             
             # Write updated workflow
-            with open('.github/workflows/codeql-analysis.yml', 'w') as f:
-                yaml.dump(workflow, f, default_flow_style=False)
-            
+            self._save_workflow('.github/workflows/codeql-analysis.yml', workflow)
+
             return True
             
         except Exception as e:
             logger.error(f"Failed to fix CodeQL workflow: {e}")
             return False
     
+    def _scan_tree_languages(self, top: str) -> set:
+        """Walk one subtree and collect the CodeQL languages found in it"""
+        all_languages = set(EXT_TO_LANG.values())
+        found = set()
+
+        for root, dirs, files in os.walk(top, followlinks=False):
+            # Skip hidden, vendored and build-output directories
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in SKIP_DIRS]
+
+            for file in files:
+                lang = EXT_TO_LANG.get(os.path.splitext(file)[1].lower())
+                if lang:
+                    found.add(lang)
+                    if found == all_languages:
+                        return found
+
+        return found
+
     def _detect_repository_languages(self) -> List[str]:
         """Detect which CodeQL-supported languages are present in the repository"""
-        supported_languages = {
-            'javascript': ['.js', '.jsx', '.ts', '.tsx', '.vue'],
-            'python': ['.py'],
-            'java': ['.java'],
-            'csharp': ['.cs'],
-            'cpp': ['.cpp', '.c', '.cc', '.cxx', '.h', '.hpp'],
-            'go': ['.go'],
-            'ruby': ['.rb']
-        }
-        
-        detected = []
-        
-        # Walk through repository files
-        for root, dirs, files in os.walk('.'):
-            # Skip .git and node_modules
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'node_modules']
-            
-            for file in files:
-                file_ext = os.path.splitext(file)[1].lower()
-                for lang, extensions in supported_languages.items():
-                    if file_ext in extensions and lang not in detected:
-                        detected.append(lang)
-        
-        return detected
+        all_languages = set(EXT_TO_LANG.values())
+        detected = set()
+
+        try:
+            entries = os.listdir('.')
+        except OSError as e:
+            logger.error(f"Failed to list repository root: {e}")
+            return []
+
+        # Top-level files are checked inline; each immediate subdirectory is
+        # walked in its own thread (the walk is syscall-bound, so threads help)
+        subdirs = []
+        for entry in entries:
+            if os.path.isdir(entry):
+                if not entry.startswith('.') and entry not in SKIP_DIRS:
+                    subdirs.append(entry)
+            else:
+                lang = EXT_TO_LANG.get(os.path.splitext(entry)[1].lower())
+                if lang:
+                    detected.add(lang)
+
+        if detected == all_languages or not subdirs:
+            return sorted(detected)
+
+        with ThreadPoolExecutor(max_workers=min(16, len(subdirs))) as executor:
+            futures = [executor.submit(self._scan_tree_languages, subdir) for subdir in subdirs]
+            for future in as_completed(futures):
+                detected |= future.result()
+                if detected == all_languages:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+
+        return sorted(detected)
     
     def _fix_metrics_workflow(self) -> bool:
         """Fix the metrics workflow"""
         try:
             # Read current workflow
-            with open('.github/workflows/metrics.yml', 'r') as f:
-                workflow = yaml.safe_load(f)
-            
+            workflow = self._load_workflow('.github/workflows/metrics.yml')
+
             # Add proper permissions
             for job_name, job in workflow.get('jobs', {}).items():
                 if 'permissions' not in job:
@@ -301,9 +713,8 @@ class GitHubActionsResolver:
                         step['continue-on-error'] = True
             
             # Write updated workflow
-            with open('.github/workflows/metrics.yml', 'w') as f:
-                yaml.dump(workflow, f, default_flow_style=False)
-            
+            self._save_workflow('.github/workflows/metrics.yml', workflow)
+
             self.fixes_applied.append("Updated metrics workflow with proper permissions and error handling")
             return True
             
@@ -321,9 +732,8 @@ class GitHubActionsResolver:
         for workflow_file in workflow_files:
             try:
                 if os.path.exists(workflow_file):
-                    with open(workflow_file, 'r') as f:
-                        workflow = yaml.safe_load(f)
-                    
+                    workflow = self._load_workflow(workflow_file)
+
                     # Add permissions at job level
                     for job_name, job in workflow.get('jobs', {}).items():
                         if 'permissions' not in job:
@@ -331,10 +741,9 @@ class GitHubActionsResolver:
                                 'contents': 'write',
                                 'actions': 'read'
                             }
-                    
-                    with open(workflow_file, 'w') as f:
-                        yaml.dump(workflow, f, default_flow_style=False)
-                    
+
+                    self._save_workflow(workflow_file, workflow)
+
                     self.fixes_applied.append(f"Added permissions to {workflow_file}")
             except Exception as e:
                 logger.error(f"Failed to fix permissions in {workflow_file}: {e}")
@@ -365,43 +774,45 @@ class GitHubActionsResolver:
     
     def generate_report(self, patterns: Dict[str, List[str]], fix_results: Dict[str, bool]) -> str:
         """Generate a comprehensive report of issues found and fixes applied"""
-        report = []
-        report.append("# CI/CD Failure Resolution Report")
-        report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"Repository: {self.repo_owner}/{self.repo_name}")
-        report.append("")
-        
+        return "\n".join(self._report_lines(patterns, fix_results))
+
+    def _report_lines(self, patterns: Dict[str, List[str]], fix_results: Dict[str, bool]):
+        """Yield the report line by line, skipping empty issue categories"""
+        yield "# CI/CD Failure Resolution Report"
+        yield f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"Repository: {self.repo_owner}/{self.repo_name}"
+        yield ""
+
         # Issues found
-        report.append("## Issues Identified")
+        yield "## Issues Identified"
         for category, issues in patterns.items():
-            if issues:
-                report.append(f"### {category.replace('_', ' ').title()}")
-                for issue in issues:
-                    report.append(f"- {issue}")
-                report.append("")
-        
+            if not issues:
+                continue
+            yield f"### {category.replace('_', ' ').title()}"
+            for issue in issues:
+                yield f"- {issue}"
+            yield ""
+
         # Fixes applied
-        report.append("## Fixes Applied")
+        yield "## Fixes Applied"
         for fix_desc, success in fix_results.items():
             status = "✅ SUCCESS" if success else "❌ FAILED"
-            report.append(f"- {status}: {fix_desc}")
-        report.append("")
-        
+            yield f"- {status}: {fix_desc}"
+        yield ""
+
         # Additional fixes applied
         if self.fixes_applied:
-            report.append("## Additional Changes")
+            yield "## Additional Changes"
             for fix in self.fixes_applied:
-                report.append(f"- {fix}")
-            report.append("")
-        
+                yield f"- {fix}"
+            yield ""
+
         # Recommendations
-        report.append("## Recommendations")
-        report.append("- Monitor workflow runs for the next 24-48 hours")
-        report.append("- Consider adding workflow status badges to README")
-        report.append("- Set up notifications for workflow failures")
-        report.append("- Review and update action versions quarterly")
-        
-        return "\n".join(report)
+        yield "## Recommendations"
+        yield "- Monitor workflow runs for the next 24-48 hours"
+        yield "- Consider adding workflow status badges to README"
+        yield "- Set up notifications for workflow failures"
+        yield "- Review and update action versions quarterly"
     
     def run_resolution_cycle(self) -> str:
         """Run a complete resolution cycle"""
@@ -412,8 +823,18 @@ class GitHubActionsResolver:
         if not failed_runs:
             return "No recent failed runs found."
         
+        # Skip the whole cycle if the same set of failing runs was just handled
+        cycle_key = (
+            f"cycle:{self.repo_owner}/{self.repo_name}:"
+            + ",".join(str(run_id) for run_id in sorted(run["id"] for run in failed_runs))
+        )
+        cached_report = self.cache.get(cycle_key)
+        if cached_report is not None:
+            logger.info("Failed-run set unchanged - returning cached resolution report")
+            return cached_report
+
         logger.info(f"Found {len(failed_runs)} failed runs to analyze")
-        
+
         # Analyze failure patterns
         patterns = self.analyze_failure_patterns(failed_runs)
         
@@ -430,6 +851,8 @@ class GitHubActionsResolver:
         with open(f"ci_resolution_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md", 'w') as f:
             f.write(report)
         
+        self.cache.set(cycle_key, report, expire=RESOLUTION_CYCLE_TTL)
+
         logger.info("Resolution cycle completed")
         return report
 